@@ -1,5 +1,7 @@
-from django.contrib import admin
-from .models import Driver, Truck, WeatherEvent, Alert
+from django.contrib import admin, messages
+from django.utils import timezone
+from .models import Driver, Truck, TruckPositionHistory, WeatherEvent, PriorityRule, Alert
+from .paginators import EstimatedCountPaginator
 
 @admin.register(Driver)
 class DriverAdmin(admin.ModelAdmin):
@@ -13,6 +15,14 @@ class TruckAdmin(admin.ModelAdmin):
     list_filter = ['is_active']
     search_fields = ['license_plate']
 
+@admin.register(TruckPositionHistory)
+class TruckPositionHistoryAdmin(admin.ModelAdmin):
+    list_display = ['truck', 'count', 'capacity']
+    list_select_related = ['truck']
+    search_fields = ['truck__license_plate']
+    exclude = ['samples']
+    readonly_fields = ['truck', 'capacity', 'head', 'count']
+
 @admin.register(WeatherEvent)
 class WeatherEventAdmin(admin.ModelAdmin):
     list_display = ['event_type', 'severity', 'location_name', 'start_time', 'is_active']
@@ -20,10 +30,45 @@ class WeatherEventAdmin(admin.ModelAdmin):
     search_fields = ['location_name', 'description']
     date_hierarchy = 'start_time'
 
+@admin.register(PriorityRule)
+class PriorityRuleAdmin(admin.ModelAdmin):
+    list_display = ['__str__', 'event_type', 'severity', 'critical_within_km', 'is_active']
+    list_editable = ['critical_within_km', 'is_active']
+    list_filter = ['event_type', 'severity', 'is_active']
+    readonly_fields = ['updated_at']
+
 @admin.register(Alert)
 class AlertAdmin(admin.ModelAdmin):
+    """Tuned for a multi-million-row Alert table"""
     list_display = ['truck', 'priority', 'status', 'created_at', 'acknowledged_at']
-    list_filter = ['priority', 'status', 'weather_event__event_type']
-    search_fields = ['truck__license_plate', 'driver__user__username']
-    date_hierarchy = 'created_at'
-    readonly_fields = ['created_at']
\ No newline at end of file
+    list_select_related = ['truck']
+    # Bounded ranges (today / past 7 days / this month / this year) instead of
+    # date_hierarchy, which scans the whole table for distinct dates
+    list_filter = ['priority', 'status', 'weather_event__event_type', ('created_at', admin.DateFieldListFilter)]
+    search_fields = ['truck__license_plate']
+    search_help_text = 'License plate prefix, e.g. TX-12'
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    raw_id_fields = ['weather_event', 'truck', 'driver']
+    readonly_fields = ['created_at']
+    actions = ['acknowledge_alerts', 'archive_alerts']
+    
+    def get_search_results(self, request, queryset, search_term):
+        """Case-sensitive prefix match on the indexed plate instead of icontains joins"""
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        return queryset.filter(truck__license_plate__startswith=search_term.upper()), False
+    
+    @admin.action(description='Acknowledge selected alerts')
+    def acknowledge_alerts(self, request, queryset):
+        # Single UPDATE statement, no per-row save()
+        updated = queryset.filter(status__in=['pending', 'delivered']).update(
+            status='acknowledged', acknowledged_at=timezone.now()
+        )
+        self.message_user(request, f"{updated} alert(s) acknowledged.", messages.SUCCESS)
+    
+    @admin.action(description='Archive selected alerts')
+    def archive_alerts(self, request, queryset):
+        updated = queryset.exclude(status='archived').update(status='archived')
+        self.message_user(request, f"{updated} alert(s) archived.", messages.SUCCESS)
\ No newline at end of file
@@ -0,0 +1,169 @@
+"""
+Parallel truck-to-event matching
+
+Large events (e.g. a heat dome over half the fleet) make alert generation
+CPU-bound on a single core. This module splits the fleet into contiguous
+truck id ranges and evaluates distance, priority and message text in a
+process pool. Workers receive compact array payloads instead of pickled
+model instances and return plain tuples, which the caller merges into one
+bulk insert.
+
+The pool is created lazily, kept for the life of the process and started
+with "forkserver" (or "spawn" where unavailable): forking a multithreaded
+web server is deadlock-prone. Model imports are deferred so those worker
+processes can import this module before Django is configured.
+"""
+import math
+import multiprocessing
+import threading
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _init_worker():
+    """Configure Django in worker processes that did not inherit it"""
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        django.setup()
+
+
+def _get_pool(workers):
+    """Shared process pool with `workers` processes, (re)created on demand"""
+    global _pool, _pool_workers
+
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context(start_method),
+                initializer=_init_worker,
+            )
+            _pool_workers = workers
+        return _pool
+
+
+def _discard_pool(pool):
+    """Forget a pool whose worker died so the next call starts a fresh one"""
+    global _pool
+
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+
+
+def event_payload(event):
+    """Reduce a WeatherEvent to the plain fields matching needs"""
+    return {
+        'event_type': event.event_type,
+        'severity': event.severity,
+        'description': event.description,
+        'center_lat': event.center_lat,
+        'center_lon': event.center_lon,
+        'radius_km': event.radius_km,
+    }
+
+
+def partition_fleet(rows, workers):
+    """
+    Split (truck_id, lat, lon, driver_id, v_north, v_east) rows into id-range partitions
+
+    Rows must already be ordered by truck id. Each partition is a tuple of
+    arrays: (ids, lats, lons, driver_ids, v_norths, v_easts). Velocities are
+    in km/min and are 0.0 for trucks without recent position history.
+    """
+    if not rows:
+        return []
+
+    size = math.ceil(len(rows) / max(workers, 1))
+    partitions = []
+    for start in range(0, len(rows), size):
+        chunk = rows[start:start + size]
+        partitions.append((
+            array('q', [row[0] for row in chunk]),
+            array('d', [row[1] for row in chunk]),
+            array('d', [row[2] for row in chunk]),
+            array('q', [row[3] for row in chunk]),
+            array('d', [row[4] for row in chunk]),
+            array('d', [row[5] for row in chunk]),
+        ))
+    return partitions
+
+
+def match_partition(event_data, partition, critical_within_km, approach_minutes=0):
+    """
+    Match one partition of trucks against an event
+
+    `critical_within_km` is the event's compiled priority threshold (see
+    priority.py), so workers never need to read PriorityRule themselves.
+
+    Returns a list of (truck_id, driver_id, priority, title, message)
+    tuples for trucks inside the affected radius, or projected to enter it
+    within `approach_minutes` when that is non-zero.
+    """
+    from .models import WeatherEvent
+    from .positions import approach_eta
+    from .services import calculate_distance, generate_message, priority_for_distance
+
+    event = WeatherEvent(**event_data)
+    ids, lats, lons, driver_ids, v_norths, v_easts = partition
+
+    matches = []
+    for i in range(len(ids)):
+        distance = calculate_distance(lats[i], lons[i], event.center_lat, event.center_lon)
+        eta = None
+        if distance > event.radius_km:
+            if not approach_minutes:
+                continue
+            eta = approach_eta(
+                lats[i], lons[i], v_norths[i], v_easts[i],
+                event.center_lat, event.center_lon, event.radius_km, approach_minutes
+            )
+            if eta is None:
+                continue
+
+        priority = priority_for_distance(critical_within_km, distance)
+        title, message = generate_message(event, priority, distance, eta)
+        matches.append((ids[i], driver_ids[i], priority, title, message))
+
+    return matches
+
+
+def match_fleet(event_data, rows, workers, critical_within_km, approach_minutes=0):
+    """
+    Match all rows against an event using up to `workers` processes
+
+    Results are returned in truck id order regardless of worker count.
+    """
+    partitions = partition_fleet(rows, workers)
+
+    if workers <= 1 or len(partitions) <= 1:
+        return [
+            match for partition in partitions
+            for match in match_partition(event_data, partition, critical_within_km, approach_minutes)
+        ]
+
+    pool = _get_pool(workers)
+    futures = [
+        pool.submit(match_partition, event_data, partition, critical_within_km, approach_minutes)
+        for partition in partitions
+    ]
+
+    matches = []
+    try:
+        for future in futures:
+            matches.extend(future.result())
+    except BrokenProcessPool:
+        _discard_pool(pool)
+        raise
+
+    return matches
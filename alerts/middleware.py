@@ -0,0 +1,28 @@
+from django.conf import settings
+
+from .routers import request_routing_state, wrote_to_primary
+
+PIN_COOKIE = 'pin_primary'
+
+
+class PrimaryStickinessMiddleware:
+    """
+    Read-your-writes across requests
+
+    A request that writes (e.g. acknowledging an alert) sets a short-lived
+    cookie. Requests carrying it read from the primary until it expires.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with request_routing_state(pinned=PIN_COOKIE in request.COOKIES):
+            response = self.get_response(request)
+            wrote = wrote_to_primary()
+
+        if wrote:
+            response.set_cookie(
+                PIN_COOKIE, '1', max_age=settings.REPLICA_STICKY_SECONDS, httponly=True, samesite='Lax'
+            )
+        return response
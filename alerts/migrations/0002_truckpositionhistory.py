@@ -0,0 +1,25 @@
+# Generated by Django 6.0.2 on 2026-10-19 19:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TruckPositionHistory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('capacity', models.PositiveIntegerField(help_text='Maximum samples kept')),
+                ('head', models.PositiveIntegerField(default=0, help_text='Next slot to write')),
+                ('count', models.PositiveIntegerField(default=0, help_text='Samples currently stored')),
+                ('samples', models.BinaryField(help_text='Packed (epoch, lat, lon) records')),
+                ('truck', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='position_history', to='alerts.truck')),
+            ],
+        ),
+    ]
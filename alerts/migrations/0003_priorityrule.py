@@ -0,0 +1,46 @@
+# Generated by Django 6.0.2 on 2026-10-19 19:02
+
+from django.db import migrations, models
+
+# The rules previously hard-coded in services.classify_alert_priority
+DEFAULT_RULES = [
+    ('', 'severe', None, 'Severe weather is always critical'),
+    ('', 'high', 20, 'High severity within 20km'),
+    ('flood', '', 10, 'Flood within 10km'),
+    ('storm', '', 10, 'Storm within 10km'),
+    ('ice', '', 10, 'Ice within 10km'),
+]
+
+
+def seed_default_rules(apps, schema_editor):
+    PriorityRule = apps.get_model('alerts', 'PriorityRule')
+    PriorityRule.objects.bulk_create([
+        PriorityRule(event_type=event_type, severity=severity, critical_within_km=km, description=description)
+        for event_type, severity, km, description in DEFAULT_RULES
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0002_truckpositionhistory'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PriorityRule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_type', models.CharField(blank=True, choices=[('storm', 'Storm'), ('flood', 'Flood'), ('snow', 'Snowfall'), ('fog', 'Heavy Fog'), ('heat', 'Extreme Heat'), ('ice', 'Ice/Freezing')], help_text='Blank matches any event type', max_length=20)),
+                ('severity', models.CharField(blank=True, choices=[('low', 'Low'), ('moderate', 'Moderate'), ('high', 'High'), ('severe', 'Severe')], help_text='Blank matches any severity', max_length=20)),
+                ('critical_within_km', models.FloatField(blank=True, help_text='Critical when closer than this; blank means always critical', null=True)),
+                ('description', models.CharField(blank=True, max_length=200)),
+                ('is_active', models.BooleanField(default=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['event_type', 'severity'],
+            },
+        ),
+        migrations.RunPython(seed_default_rules, migrations.RunPython.noop),
+    ]
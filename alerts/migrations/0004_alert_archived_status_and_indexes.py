@@ -0,0 +1,22 @@
+# Generated by Django 6.0.2 on 2026-10-19 19:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0003_priorityrule'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='alert',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('delivered', 'Delivered'), ('acknowledged', 'Acknowledged'), ('archived', 'Archived')], default='pending', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='alert',
+            index=models.Index(fields=['-created_at'], name='alert_created_idx'),
+        ),
+    ]
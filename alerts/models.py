@@ -1,6 +1,11 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
 from django.db import models
 from django.contrib.auth.models import User
 
+from . import positions
+
 class Driver(models.Model):
     """Truck driver information"""
     user = models.OneToOneField(User, on_delete=models.CASCADE)
@@ -12,6 +17,8 @@ class Driver(models.Model):
 
 class Truck(models.Model):
     """Fleet truck with GPS location"""
+    # The unique index also serves prefix searches (LIKE 'TX-1%'); on PostgreSQL
+    # Django adds a varchar_pattern_ops "_like" index alongside it
     license_plate = models.CharField(max_length=20, unique=True, db_index=True)
     current_driver = models.ForeignKey(Driver, null=True, blank=True, on_delete=models.SET_NULL)
     current_lat = models.FloatField(null=True, blank=True, help_text="Latitude")
@@ -25,6 +32,60 @@ class Truck(models.Model):
     class Meta:
         ordering = ['license_plate']
 
+class TruckPositionHistory(models.Model):
+    """Ring buffer of recent GPS positions for a truck (see alerts/positions.py)"""
+    truck = models.OneToOneField(Truck, on_delete=models.CASCADE, related_name='position_history')
+    capacity = models.PositiveIntegerField(help_text="Maximum samples kept")
+    head = models.PositiveIntegerField(default=0, help_text="Next slot to write")
+    count = models.PositiveIntegerField(default=0, help_text="Samples currently stored")
+    samples = models.BinaryField(help_text="Packed (epoch, lat, lon) records")
+    
+    def __str__(self):
+        return f"{self.truck_id}: {self.count} positions"
+    
+    @classmethod
+    def for_truck_id(cls, truck_id):
+        """Empty history sized by settings.POSITION_HISTORY_CAPACITY"""
+        capacity = settings.POSITION_HISTORY_CAPACITY
+        return cls(truck_id=truck_id, capacity=capacity, samples=positions.empty_buffer(capacity))
+    
+    def append(self, samples):
+        """Append (datetime, lat, lon) samples; caller is responsible for saving"""
+        self.samples, self.head, self.count = positions.append_samples(
+            self.samples, self.head, self.count,
+            [(int(when.timestamp()), lat, lon) for when, lat, lon in samples]
+        )
+    
+    def latest(self):
+        """Most recent (datetime, lat, lon) sample, or None"""
+        sample = positions.latest_sample(self.samples, self.head, self.count)
+        if sample is None:
+            return None
+        epoch, lat, lon = sample
+        return datetime.fromtimestamp(epoch, dt_timezone.utc), lat, lon
+    
+    def between(self, start=None, end=None):
+        """(datetime, lat, lon) samples recorded between start and end, oldest first"""
+        rows = positions.samples_between(
+            self.samples, self.head, self.count,
+            None if start is None else int(start.timestamp()),
+            None if end is None else int(end.timestamp()),
+        )
+        return [(datetime.fromtimestamp(epoch, dt_timezone.utc), lat, lon) for epoch, lat, lon in rows]
+    
+    def position_at(self, when):
+        """Last known (datetime, lat, lon) at or before `when`, e.g. when an alert fired"""
+        sample = positions.sample_at_or_before(self.samples, self.head, self.count, int(when.timestamp()))
+        if sample is None:
+            return None
+        epoch, lat, lon = sample
+        return datetime.fromtimestamp(epoch, dt_timezone.utc), lat, lon
+    
+    def motion(self, now, window_minutes):
+        """(v_north, v_east) in km/min over the trailing window, or None if stale"""
+        start = now - timedelta(minutes=window_minutes)
+        return positions.window_velocity(self.samples, self.head, self.count, int(start.timestamp()))
+
 class WeatherEvent(models.Model):
     """Weather event that affects trucks"""
     SEVERITY_CHOICES = [
@@ -60,6 +121,28 @@ class WeatherEvent(models.Model):
     class Meta:
         ordering = ['-start_time']
 
+class PriorityRule(models.Model):
+    """Data-driven priority rule: matching alerts are critical within a distance"""
+    event_type = models.CharField(max_length=20, choices=WeatherEvent.EVENT_TYPES, blank=True,
+                                  help_text="Blank matches any event type")
+    severity = models.CharField(max_length=20, choices=WeatherEvent.SEVERITY_CHOICES, blank=True,
+                                help_text="Blank matches any severity")
+    critical_within_km = models.FloatField(null=True, blank=True,
+                                           help_text="Critical when closer than this; blank means always critical")
+    description = models.CharField(max_length=200, blank=True)
+    is_active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        event_type = self.get_event_type_display() or 'Any event'
+        severity = self.get_severity_display() or 'any severity'
+        if self.critical_within_km is None:
+            return f"{event_type} / {severity}: always critical"
+        return f"{event_type} / {severity}: critical within {self.critical_within_km:g}km"
+    
+    class Meta:
+        ordering = ['event_type', 'severity']
+
 class Alert(models.Model):
     """Alert sent to driver about weather event"""
     PRIORITY_CRITICAL = 'critical'
@@ -73,6 +156,7 @@ class Alert(models.Model):
         ('pending', 'Pending'),
         ('delivered', 'Delivered'),
         ('acknowledged', 'Acknowledged'),
+        ('archived', 'Archived'),
     ]
     
     weather_event = models.ForeignKey(WeatherEvent, on_delete=models.CASCADE)
@@ -91,6 +175,9 @@ class Alert(models.Model):
     class Meta:
         ordering = ['-created_at']
         unique_together = ['weather_event', 'truck']  # Prevent duplicate alerts
+        indexes = [
+            models.Index(fields=['-created_at'], name='alert_created_idx'),
+        ]
     
     def __str__(self):
         return f"{self.priority.upper()}: {self.truck.license_plate}"
\ No newline at end of file
@@ -0,0 +1,158 @@
+"""
+Compact per-truck position history
+
+Each truck keeps a fixed-capacity ring buffer of GPS samples packed as
+little-endian (uint32 epoch seconds, float32 lat, float32 lon) records,
+12 bytes per sample, stored in one binary column. Once the buffer is full,
+new samples overwrite the oldest ones.
+
+Everything here works on plain bytes and numbers, so it can also run inside
+matching worker processes.
+"""
+import math
+import struct
+
+SAMPLE = struct.Struct('<Iff')
+KM_PER_DEGREE = 6371 * math.pi / 180
+
+# Range of the uint32 epoch field: 1970-01-01 to 2106-02-07 UTC
+MIN_EPOCH = 0
+MAX_EPOCH = 2 ** 32 - 1
+
+
+def empty_buffer(capacity):
+    """Zero-filled ring buffer able to hold `capacity` samples"""
+    return bytes(capacity * SAMPLE.size)
+
+
+def _slot(head, count, capacity, index):
+    """Byte offset of the index-th oldest sample"""
+    return ((head - count + index) % capacity) * SAMPLE.size
+
+
+def append_samples(buffer, head, count, samples):
+    """
+    Append (epoch, lat, lon) samples to a ring buffer
+
+    The buffer is append-only: samples not newer than the latest stored
+    one (late or duplicate GPS fixes) are dropped, as are samples outside
+    the storable epoch range.
+    Returns the new (buffer, head, count).
+    """
+    capacity = len(buffer) // SAMPLE.size
+    data = bytearray(buffer)
+    latest = latest_sample(buffer, head, count)
+    latest = latest[0] if latest else -1
+
+    for epoch, lat, lon in sorted(samples):
+        if epoch <= latest or not MIN_EPOCH <= epoch <= MAX_EPOCH:
+            continue
+        SAMPLE.pack_into(data, head * SAMPLE.size, epoch, lat, lon)
+        head = (head + 1) % capacity
+        count = min(count + 1, capacity)
+        latest = epoch
+
+    return bytes(data), head, count
+
+
+def latest_sample(buffer, head, count):
+    """Most recent (epoch, lat, lon) sample, or None if the buffer is empty"""
+    if not count:
+        return None
+    capacity = len(buffer) // SAMPLE.size
+    return SAMPLE.unpack_from(buffer, _slot(head, count, capacity, count - 1))
+
+
+def _first_index(buffer, head, count, predicate):
+    """
+    Index of the oldest sample whose epoch satisfies a monotonic predicate
+    (count if none do). Samples are time-ordered, so this is a binary search
+    that unpacks only O(log n) records.
+    """
+    capacity = len(buffer) // SAMPLE.size
+    low, high = 0, count
+    while low < high:
+        mid = (low + high) // 2
+        if predicate(SAMPLE.unpack_from(buffer, _slot(head, count, capacity, mid))[0]):
+            high = mid
+        else:
+            low = mid + 1
+    return low
+
+
+def _sample(buffer, head, count, index):
+    return SAMPLE.unpack_from(buffer, _slot(head, count, len(buffer) // SAMPLE.size, index))
+
+
+def samples_between(buffer, head, count, start=None, end=None):
+    """Range query: (epoch, lat, lon) samples with start <= epoch <= end, oldest first"""
+    first = 0 if start is None else _first_index(buffer, head, count, lambda epoch: epoch >= start)
+    last = count if end is None else _first_index(buffer, head, count, lambda epoch: epoch > end)
+
+    return [_sample(buffer, head, count, i) for i in range(first, last)]
+
+
+def sample_at_or_before(buffer, head, count, epoch):
+    """Last (epoch, lat, lon) sample recorded at or before `epoch`, or None"""
+    index = _first_index(buffer, head, count, lambda sample_epoch: sample_epoch > epoch) - 1
+    return _sample(buffer, head, count, index) if index >= 0 else None
+
+
+def window_velocity(buffer, head, count, start):
+    """
+    Velocity over samples recorded since `start`, as (v_north, v_east) km/min
+
+    Only the first and last samples of the window are unpacked. Returns
+    None when the window holds fewer than two samples.
+    """
+    first = _first_index(buffer, head, count, lambda epoch: epoch >= start)
+    if count - first < 2:
+        return None
+    return velocity([_sample(buffer, head, count, first), _sample(buffer, head, count, count - 1)])
+
+
+def velocity(samples):
+    """
+    Average velocity across time-ordered samples as (v_north, v_east) in km/min
+    Returns None when there are fewer than two distinct timestamps.
+    """
+    if len(samples) < 2:
+        return None
+
+    (t0, lat0, lon0), (t1, lat1, lon1) = samples[0], samples[-1]
+    minutes = (t1 - t0) / 60
+    if minutes <= 0:
+        return None
+
+    mean_lat = math.radians((lat0 + lat1) / 2)
+    v_north = (lat1 - lat0) * KM_PER_DEGREE / minutes
+    v_east = (lon1 - lon0) * KM_PER_DEGREE * math.cos(mean_lat) / minutes
+    return v_north, v_east
+
+
+def approach_eta(lat, lon, v_north, v_east, center_lat, center_lon, radius_km, horizon_minutes):
+    """
+    Minutes until a truck on a straight-line course enters an event radius
+
+    Uses a flat projection around the truck, which is accurate enough for
+    alerting horizons of tens of minutes. Returns None if the truck is not
+    projected to enter within `horizon_minutes`.
+    """
+    # Event centre relative to the truck, in km
+    p_north = (center_lat - lat) * KM_PER_DEGREE
+    p_east = (center_lon - lon) * KM_PER_DEGREE * math.cos(math.radians(lat))
+
+    # Solve |p - v*t| = radius for the first t >= 0
+    a = v_north ** 2 + v_east ** 2
+    if a == 0:
+        return None
+    b = p_north * v_north + p_east * v_east
+    c = p_north ** 2 + p_east ** 2 - radius_km ** 2
+    discriminant = b ** 2 - a * c
+    if discriminant < 0:
+        return None
+
+    eta = (b - math.sqrt(discriminant)) / a
+    if eta < 0 or eta > horizon_minutes:
+        return None
+    return eta
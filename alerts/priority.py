@@ -0,0 +1,72 @@
+"""
+Compiled alert priority rules
+
+PriorityRule rows are compiled into a lookup table keyed by
+(event_type, severity). Each entry is a critical-distance threshold: an
+alert is critical when the truck is closer than the threshold. When several
+rules apply, the largest threshold wins. A rule without a distance makes
+the pair always critical (infinite threshold).
+
+The table is cached per process. Saving or deleting a rule clears the local
+cache (see signals.py). Other processes pick up the change on their next
+refresh_priority_table() call, which compares a cheap version stamp:
+(rule count, latest updated_at). Bulk .update() calls bypass auto_now, so
+they must set updated_at themselves to be noticed.
+"""
+import math
+
+from django.db.models import Count, Max
+
+from .models import PriorityRule, WeatherEvent
+
+_table = None
+_version = None
+
+
+def compile_priority_table(rules):
+    """Build the {(event_type, severity): threshold_km} table from rules"""
+    table = {
+        (event_type, severity): 0.0
+        for event_type, _ in WeatherEvent.EVENT_TYPES
+        for severity, _ in WeatherEvent.SEVERITY_CHOICES
+    }
+
+    for rule in rules:
+        threshold = math.inf if rule.critical_within_km is None else rule.critical_within_km
+        for event_type, severity in table:
+            if rule.event_type in ('', event_type) and rule.severity in ('', severity):
+                table[event_type, severity] = max(table[event_type, severity], threshold)
+
+    return table
+
+
+def _rules_version():
+    stamp = PriorityRule.objects.aggregate(count=Count('id'), updated=Max('updated_at'))
+    return stamp['count'], stamp['updated']
+
+
+def refresh_priority_table():
+    """Return the compiled table, recompiling it if rules changed in any process"""
+    global _table, _version
+
+    version = _rules_version()
+    if _table is None or version != _version:
+        _table = compile_priority_table(PriorityRule.objects.filter(is_active=True))
+        _version = version
+    return _table
+
+
+def priority_table():
+    """Return the cached table, compiling it on first use"""
+    return _table if _table is not None else refresh_priority_table()
+
+
+def invalidate_priority_table():
+    """Drop this process's cached table"""
+    global _table
+    _table = None
+
+
+def critical_threshold(event_type, severity):
+    """Critical-distance threshold in km for an event type and severity"""
+    return priority_table().get((event_type, severity), 0.0)
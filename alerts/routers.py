@@ -0,0 +1,93 @@
+"""
+Primary/replica database routing
+
+Writes and ordinary reads go to 'default' (the primary). Read-heavy views
+(dashboard, alert list, API list endpoints) opt in to the 'replica' alias
+with the replica_reads decorator. Alert generation and acknowledgements
+therefore never read stale data.
+
+Read-your-writes: once a request writes, later reads in that request stay
+on the primary. PrimaryStickinessMiddleware also pins the client's next
+requests to the primary for settings.REPLICA_STICKY_SECONDS, so an
+acknowledged alert does not reappear while the replica catches up.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+
+REPLICA = 'replica'
+
+_use_replica = ContextVar('use_replica', default=False)
+_pinned_to_primary = ContextVar('pinned_to_primary', default=False)
+# None outside a request, so writes from scripts, shells and worker
+# threads never leave a flag behind
+_wrote_to_primary = ContextVar('wrote_to_primary', default=None)
+
+
+def replica_configured():
+    return REPLICA in settings.DATABASES
+
+
+@contextmanager
+def replica_reading():
+    """Route reads inside the block to the replica (if configured and not pinned)"""
+    token = _use_replica.set(True)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+def replica_reads(view):
+    """Decorator: run a read-only view (or viewset method) against the replica"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        with replica_reading():
+            return view(*args, **kwargs)
+    return wrapper
+
+
+@contextmanager
+def request_routing_state(pinned):
+    """Per-request routing state, managed by PrimaryStickinessMiddleware"""
+    pinned_token = _pinned_to_primary.set(pinned)
+    wrote_token = _wrote_to_primary.set(False)
+    try:
+        yield
+    finally:
+        _pinned_to_primary.reset(pinned_token)
+        _wrote_to_primary.reset(wrote_token)
+
+
+def wrote_to_primary():
+    """Whether the current request has written; None outside a request"""
+    return _wrote_to_primary.get()
+
+
+class PrimaryReplicaRouter:
+    """Send opted-in reads to the replica and everything else to the primary"""
+
+    def db_for_read(self, model, **hints):
+        if (
+            _use_replica.get()
+            and replica_configured()
+            and not _pinned_to_primary.get()
+            and not _wrote_to_primary.get()
+        ):
+            return REPLICA
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        if _wrote_to_primary.get() is not None:
+            _wrote_to_primary.set(True)
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica receives schema changes through replication
+        return db == 'default'
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from . import positions
 from .models import Alert, Truck, Driver, WeatherEvent
 
 class AlertSerializer(serializers.ModelSerializer):
@@ -28,4 +29,104 @@ class TruckSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Truck
-        fields = ['id', 'license_plate', 'driver_name', 'current_lat', 'current_lon', 'is_active']
\ No newline at end of file
+        fields = ['id', 'license_plate', 'driver_name', 'current_lat', 'current_lon', 'is_active']
+
+class PositionSampleSerializer(serializers.Serializer):
+    """One GPS fix from the ingest feed"""
+    truck_id = serializers.IntegerField()
+    recorded_at = serializers.DateTimeField()
+    lat = serializers.FloatField(min_value=-90, max_value=90)
+    lon = serializers.FloatField(min_value=-180, max_value=180)
+    
+    def validate_recorded_at(self, value):
+        # The position history stores timestamps as unsigned 32-bit epoch seconds
+        if not positions.MIN_EPOCH <= value.timestamp() <= positions.MAX_EPOCH:
+            raise serializers.ValidationError("Timestamp must be between 1970 and 2106.")
+        return value
+
+class HistoryRangeSerializer(serializers.Serializer):
+    """Optional ?start= / ?end= bounds for a truck's position history"""
+    start = serializers.DateTimeField(required=False)
+    end = serializers.DateTimeField(required=False)
+
+# ===== VALUES() FAST PATH =====
+# Opt-in (settings.FAST_LIST_SERIALIZATION) for list endpoints returning
+# thousands of rows. Rows are read with .values() and choice labels come from
+# precomputed dicts, so no model instances or serializer fields are built per
+# row. Output must stay identical to the ModelSerializers above.
+
+_datetime_field = serializers.DateTimeField()
+_event_type_labels = dict(WeatherEvent.EVENT_TYPES)
+_severity_labels = dict(WeatherEvent.SEVERITY_CHOICES)
+
+
+def _datetime(value):
+    return None if value is None else _datetime_field.to_representation(value)
+
+
+def _full_name(first_name, last_name):
+    # Mirrors User.get_full_name()
+    return f"{first_name} {last_name}".strip()
+
+
+class ValuesSerializer:
+    """Base class for read-only serializers built on queryset.values()"""
+    values_fields = ()
+    
+    def __init__(self, queryset):
+        self.queryset = queryset
+    
+    @property
+    def data(self):
+        to_representation = self.to_representation
+        return [to_representation(row) for row in self.queryset.values(*self.values_fields)]
+
+
+class AlertValuesSerializer(ValuesSerializer):
+    """values() equivalent of AlertSerializer"""
+    values_fields = (
+        'id', 'truck__license_plate', 'driver__user__first_name', 'driver__user__last_name',
+        'weather_event__event_type', 'weather_event__severity',
+        'priority', 'status', 'title', 'message', 'created_at', 'acknowledged_at',
+    )
+    
+    def to_representation(self, row):
+        event_type = row['weather_event__event_type']
+        severity = row['weather_event__severity']
+        return {
+            'id': row['id'],
+            'truck_plate': row['truck__license_plate'],
+            'driver_name': _full_name(row['driver__user__first_name'], row['driver__user__last_name']),
+            'event_type': _event_type_labels.get(event_type, event_type),
+            'event_severity': _severity_labels.get(severity, severity),
+            'priority': row['priority'],
+            'status': row['status'],
+            'title': row['title'],
+            'message': row['message'],
+            'created_at': _datetime(row['created_at']),
+            'acknowledged_at': _datetime(row['acknowledged_at']),
+        }
+
+
+class TruckValuesSerializer(ValuesSerializer):
+    """values() equivalent of TruckSerializer"""
+    values_fields = (
+        'id', 'license_plate', 'current_driver_id',
+        'current_driver__user__first_name', 'current_driver__user__last_name',
+        'current_lat', 'current_lon', 'is_active',
+    )
+    
+    def to_representation(self, row):
+        data = {
+            'id': row['id'],
+            'license_plate': row['license_plate'],
+        }
+        # TruckSerializer omits driver_name (rather than nulling it) when unassigned
+        if row['current_driver_id'] is not None:
+            data['driver_name'] = _full_name(
+                row['current_driver__user__first_name'], row['current_driver__user__last_name']
+            )
+        data['current_lat'] = row['current_lat']
+        data['current_lon'] = row['current_lon']
+        data['is_active'] = row['is_active']
+        return data
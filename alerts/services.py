@@ -1,5 +1,11 @@
-from .models import Alert, Truck, WeatherEvent
+from .models import Alert, Truck, TruckPositionHistory, WeatherEvent
+from .matching import event_payload, match_fleet
+from .positions import KM_PER_DEGREE, approach_eta
+from .priority import critical_threshold, refresh_priority_table
+from django.conf import settings
+from django.db import IntegrityError, transaction
 from django.utils import timezone
+from collections import defaultdict
 import math
 
 def calculate_distance(lat1, lon1, lat2, lon2):
@@ -24,46 +30,198 @@ def classify_alert_priority(weather_event, distance_km):
     """
     Determine if alert should be critical or standard
     
-    Business Rules:
+    Business rules are PriorityRule rows (editable in admin). The defaults:
     - Severe weather = always critical
     - High severity within 20km = critical
-    - Flood/Storm within 10km = critical
+    - Flood/Storm/Ice within 10km = critical
     - Everything else = standard
-    """
-    # Rule 1: Severe events are always critical
-    if weather_event.severity == 'severe':
-        return Alert.PRIORITY_CRITICAL
-    
-    # Rule 2: High severity close by
-    if weather_event.severity == 'high' and distance_km < 20:
-        return Alert.PRIORITY_CRITICAL
     
-    # Rule 3: Dangerous event types close by
-    if weather_event.event_type in ['flood', 'storm', 'ice'] and distance_km < 10:
+    Rules are compiled into one critical-distance threshold per
+    (event_type, severity), see alerts/priority.py
+    """
+    threshold = critical_threshold(weather_event.event_type, weather_event.severity)
+    return priority_for_distance(threshold, distance_km)
+
+def priority_for_distance(critical_within_km, distance_km):
+    """Classify against a precompiled threshold: one comparison per truck"""
+    if distance_km < critical_within_km:
         return Alert.PRIORITY_CRITICAL
-    
-    # Default to standard
     return Alert.PRIORITY_STANDARD
 
-def generate_message(weather_event, priority, distance_km):
-    """Create alert title and message based on priority"""
+def generate_message(weather_event, priority, distance_km, eta_minutes=None):
+    """
+    Create alert title and message based on priority
+    eta_minutes is set for trucks outside the radius but heading into it
+    """
     if priority == Alert.PRIORITY_CRITICAL:
         title = f"⚠️ CRITICAL: {weather_event.get_event_type_display()}"
         message = f"{weather_event.description}\n\n"
         message += f"Distance: {distance_km:.1f}km from your location.\n"
+        if eta_minutes is not None:
+            message += f"Current heading enters the affected area in about {eta_minutes:.0f} min.\n"
         message += f"IMMEDIATE ACTION REQUIRED - Contact dispatch."
     else:
         title = f"Weather Advisory: {weather_event.get_event_type_display()}"
         message = f"{weather_event.description}\n\n"
         message += f"Distance: {distance_km:.1f}km from your location.\n"
+        if eta_minutes is not None:
+            message += f"Current heading enters the affected area in about {eta_minutes:.0f} min.\n"
         message += f"Monitor conditions and adjust route if necessary."
     
     return title, message
 
-def generate_alerts_for_event(weather_event_id):
+def record_positions(updates):
+    """
+    Bulk GPS ingest: append (truck_id, recorded_at, lat, lon) samples
+    
+    Appends to each truck's position history ring buffer. A truck's current
+    position moves to its newest input sample only if the buffer accepted it
+    as newer than everything stored, so late fixes never move a truck
+    backwards. The current position keeps the input's full precision (the
+    buffer stores float32 / whole seconds). Unknown truck ids are ignored.
+    Returns the number of trucks whose current position changed.
+    """
+    by_truck = defaultdict(list)
+    for truck_id, recorded_at, lat, lon in updates:
+        by_truck[truck_id].append((recorded_at, lat, lon))
+    
+    with transaction.atomic():
+        trucks = list(Truck.objects.filter(id__in=by_truck))
+        if not trucks:
+            return 0
+        
+        TruckPositionHistory.objects.bulk_create(
+            [TruckPositionHistory.for_truck_id(truck.id) for truck in trucks],
+            ignore_conflicts=True
+        )
+        histories = list(TruckPositionHistory.objects.select_for_update().filter(truck__in=trucks))
+        
+        newest = {}
+        for history in histories:
+            samples = by_truck[history.truck_id]
+            before = history.latest()
+            history.append(samples)
+            after = history.latest()
+            
+            newest_sample = max(samples, key=lambda sample: sample[0])
+            accepted = (
+                after is not None
+                and (before is None or after[0] > before[0])
+                and int(newest_sample[0].timestamp()) == int(after[0].timestamp())
+            )
+            if accepted:
+                newest[history.truck_id] = newest_sample
+        TruckPositionHistory.objects.bulk_update(histories, ['head', 'count', 'samples'])
+        
+        moved = [truck for truck in trucks if truck.id in newest]
+        for truck in moved:
+            truck.last_update, truck.current_lat, truck.current_lon = newest[truck.id]
+        Truck.objects.bulk_update(moved, ['current_lat', 'current_lon', 'last_update'])
+    
+    return len(moved)
+
+def approaching_truck_ids(event, active_trucks, approach_minutes):
+    """
+    Trucks outside the event radius that could reach it within the horizon
+    
+    Only trucks within radius + max speed x horizon qualify: a bounding box
+    in SQL, then the exact distance. Trucks already inside are excluded
+    since they are alerted anyway.
+    """
+    reach_km = event.radius_km + settings.TRUCK_MAX_SPEED_KMH / 60 * approach_minutes
+    
+    dlat = reach_km / KM_PER_DEGREE
+    candidates = active_trucks.filter(current_lat__range=(event.center_lat - dlat, event.center_lat + dlat))
+    
+    # Widest longitude span occurs at the box edge furthest from the equator
+    edge_lat = min(abs(event.center_lat) + dlat, 89.0)
+    dlon = reach_km / (KM_PER_DEGREE * math.cos(math.radians(edge_lat)))
+    if -180 <= event.center_lon - dlon and event.center_lon + dlon <= 180:
+        candidates = candidates.filter(current_lon__range=(event.center_lon - dlon, event.center_lon + dlon))
+    
+    return [
+        truck_id
+        for truck_id, lat, lon in candidates.values_list('id', 'current_lat', 'current_lon')
+        if event.radius_km < calculate_distance(lat, lon, event.center_lat, event.center_lon) <= reach_km
+    ]
+
+def truck_motions(truck_ids):
+    """Map truck id -> (v_north, v_east) km/min from recent position history"""
+    now = timezone.now()
+    window = settings.POSITION_TREND_WINDOW_MINUTES
+    truck_ids = list(truck_ids)
+    motions = {}
+    for start in range(0, len(truck_ids), 500):
+        histories = TruckPositionHistory.objects.filter(truck_id__in=truck_ids[start:start + 500], count__gte=2)
+        for history in histories:
+            motion = history.motion(now, window)
+            if motion is not None:
+                motions[history.truck_id] = motion
+    return motions
+
+def approach_motions(event, active_trucks, approach_minutes):
+    """Motions of trucks that might head into the event; empty when disabled"""
+    if not approach_minutes:
+        return {}
+    return truck_motions(approaching_truck_ids(event, active_trucks, approach_minutes))
+
+def generate_alerts_in_parallel(event, active_trucks, workers):
+    """
+    Parallel matching mode: evaluate trucks in a process pool, then bulk insert
+    Used for large events where per-truck Python work dominates
+    """
+    approach_minutes = settings.ALERT_APPROACH_MINUTES
+    motions = approach_motions(event, active_trucks, approach_minutes)
+    
+    # Skip trucks that already have an alert for this event (prevent duplicates)
+    existing = set(Alert.objects.filter(weather_event=event).values_list('truck_id', flat=True))
+    rows = [
+        (truck_id, lat, lon, driver_id) + motions.get(truck_id, (0.0, 0.0))
+        for truck_id, lat, lon, driver_id in active_trucks.order_by('id').values_list(
+            'id', 'current_lat', 'current_lon', 'current_driver_id'
+        )
+        if truck_id not in existing
+    ]
+    
+    threshold = critical_threshold(event.event_type, event.severity)
+    matches = match_fleet(event_payload(event), rows, workers, threshold, approach_minutes)
+    
+    while True:
+        alerts = [
+            Alert(
+                weather_event=event,
+                truck_id=truck_id,
+                driver_id=driver_id,
+                priority=priority,
+                status='pending',
+                title=title,
+                message=message
+            )
+            for truck_id, driver_id, priority, title, message in matches
+        ]
+        try:
+            with transaction.atomic():
+                Alert.objects.bulk_create(alerts, batch_size=settings.ALERT_BULK_BATCH_SIZE)
+            break
+        except IntegrityError:
+            # A concurrent run inserted some of the same (event, truck) pairs:
+            # drop those and retry, so the count reflects rows we inserted
+            existing = set(Alert.objects.filter(weather_event=event).values_list('truck_id', flat=True))
+            remaining = [match for match in matches if match[0] not in existing]
+            if len(remaining) == len(matches):
+                raise
+            matches = remaining
+    
+    print(f"Total alerts created: {len(alerts)} ({workers} workers)")
+    return len(alerts)
+
+def generate_alerts_for_event(weather_event_id, workers=None):
     """
     Main function: Generate alerts for all trucks affected by weather event
     Called automatically when weather event is created
+    
+    workers > 1 switches to the parallel matching mode; defaults to
+    settings.ALERT_MATCHING_WORKERS
     """
     try:
         event = WeatherEvent.objects.get(id=weather_event_id)
@@ -79,6 +237,20 @@ def generate_alerts_for_event(weather_event_id):
         current_driver__isnull=False  # Must have a driver
     )
     
+    # Pick up rule edits made in other processes
+    refresh_priority_table()
+    
+    if workers is None:
+        workers = settings.ALERT_MATCHING_WORKERS
+    
+    if workers > 1:
+        return generate_alerts_in_parallel(event, active_trucks, workers)
+    
+    # Trend-aware matching: also alert trucks heading into the radius
+    approach_minutes = settings.ALERT_APPROACH_MINUTES
+    motions = approach_motions(event, active_trucks, approach_minutes)
+    
+    threshold = critical_threshold(event.event_type, event.severity)
     alerts_created = 0
     
     for truck in active_trucks:
@@ -88,9 +260,17 @@ def generate_alerts_for_event(weather_event_id):
             event.center_lat, event.center_lon
         )
         
-        # Skip if truck is outside affected radius
+        # Skip if truck is outside affected radius and not heading into it
+        eta = None
         if distance > event.radius_km:
-            continue
+            if truck.id not in motions:
+                continue
+            eta = approach_eta(
+                truck.current_lat, truck.current_lon, *motions[truck.id],
+                event.center_lat, event.center_lon, event.radius_km, approach_minutes
+            )
+            if eta is None:
+                continue
         
         # Check if alert already exists (prevent duplicates)
         if Alert.objects.filter(weather_event=event, truck=truck).exists():
@@ -98,10 +278,10 @@ def generate_alerts_for_event(weather_event_id):
             continue
         
         # Classify priority based on severity and distance
-        priority = classify_alert_priority(event, distance)
+        priority = priority_for_distance(threshold, distance)
         
         # Generate message
-        title, message = generate_message(event, priority, distance)
+        title, message = generate_message(event, priority, distance, eta)
         
         # Create alert
         alert = Alert.objects.create(
@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import PriorityRule
+from .priority import invalidate_priority_table
+
+
+@receiver([post_save, post_delete], sender=PriorityRule)
+def priority_rules_changed(sender, **kwargs):
+    """Recompile the priority table after any rule edit"""
+    invalidate_priority_table()
@@ -1,3 +1,568 @@
-from django.test import TestCase
+from datetime import datetime, timedelta, timezone as dt_timezone
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connections
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from . import positions, priority
+from .matching import event_payload, match_fleet
+from .middleware import PIN_COOKIE, PrimaryStickinessMiddleware
+from .models import Alert, Driver, PriorityRule, Truck, TruckPositionHistory, WeatherEvent
+from .paginators import EstimatedCountPaginator
+from .priority import compile_priority_table, critical_threshold, refresh_priority_table
+from .routers import (
+    REPLICA, PrimaryReplicaRouter, replica_configured, replica_reading, request_routing_state, wrote_to_primary,
+)
+from .serializers import AlertSerializer, AlertValuesSerializer, TruckSerializer, TruckValuesSerializer
+from .services import (
+    approaching_truck_ids, classify_alert_priority, generate_alerts_for_event, priority_for_distance, record_positions,
+)
+
+
+def make_truck(plate='TEST-001', lat=29.76, lon=-95.37):
+    user = User.objects.create(username=f"driver_{plate}")
+    driver = Driver.objects.create(user=user, phone_number='+1-555-0000')
+    return Truck.objects.create(license_plate=plate, current_driver=driver, current_lat=lat, current_lon=lon)
+
+
+def make_alert(truck, status='pending', priority='critical'):
+    event = WeatherEvent.objects.create(
+        event_type='storm', severity='high', location_name='Test', center_lat=truck.current_lat,
+        center_lon=truck.current_lon, radius_km=10, description='Test storm',
+        start_time=datetime(2024, 5, 1, tzinfo=dt_timezone.utc),
+    )
+    return Alert.objects.create(
+        weather_event=event, truck=truck, driver=truck.current_driver, priority=priority, status=status,
+        title='Test alert', message='Test alert',
+    )
+
+
+def utc(epoch):
+    return datetime.fromtimestamp(epoch, dt_timezone.utc)
+
+
+class RingBufferTests(TestCase):
+    """alerts/positions.py on plain bytes"""
+
+    def filled(self, capacity, epochs):
+        return positions.append_samples(
+            positions.empty_buffer(capacity), 0, 0, [(epoch, 30.0, -95.0) for epoch in epochs]
+        )
+
+    def epochs(self, buffer, head, count, start=None, end=None):
+        return [sample[0] for sample in positions.samples_between(buffer, head, count, start, end)]
+
+    def test_wraparound_keeps_newest_samples_in_order(self):
+        buffer, head, count = self.filled(4, [100, 200, 300, 400, 500, 600])
+        self.assertEqual((head, count), (2, 4))
+        self.assertEqual(self.epochs(buffer, head, count), [300, 400, 500, 600])
+        self.assertEqual(positions.latest_sample(buffer, head, count)[0], 600)
+
+    def test_late_duplicate_and_unstorable_samples_are_dropped(self):
+        buffer, head, count = self.filled(4, [100, 200])
+        buffer, head, count = positions.append_samples(
+            buffer, head, count, [(150, 0.0, 0.0), (200, 0.0, 0.0), (-5, 0.0, 0.0), (2 ** 32, 0.0, 0.0)]
+        )
+        self.assertEqual(self.epochs(buffer, head, count), [100, 200])
+
+    def test_samples_between_bounds_are_inclusive(self):
+        buffer, head, count = self.filled(4, [100, 200, 300, 400, 500, 600])
+        self.assertEqual(self.epochs(buffer, head, count, 400, 500), [400, 500])
+        self.assertEqual(self.epochs(buffer, head, count, 350, 550), [400, 500])
+        self.assertEqual(self.epochs(buffer, head, count, start=500), [500, 600])
+        self.assertEqual(self.epochs(buffer, head, count, end=300), [300])
+        self.assertEqual(self.epochs(buffer, head, count, 0, 200), [])
+        self.assertEqual(self.epochs(buffer, head, count, 700, 800), [])
+        self.assertEqual(self.epochs(buffer, head, count, 500, 400), [])
+
+    def test_sample_at_or_before(self):
+        buffer, head, count = self.filled(4, [100, 200, 300, 400, 500, 600])
+        self.assertEqual(positions.sample_at_or_before(buffer, head, count, 450)[0], 400)
+        self.assertEqual(positions.sample_at_or_before(buffer, head, count, 600)[0], 600)
+        self.assertEqual(positions.sample_at_or_before(buffer, head, count, 10 ** 6)[0], 600)
+        self.assertIsNone(positions.sample_at_or_before(buffer, head, count, 299))
+
+    def test_window_velocity_uses_trailing_window(self):
+        # Stationary for a while, then 1 degree north over 10 minutes
+        buffer, head, count = positions.append_samples(positions.empty_buffer(8), 0, 0, [
+            (0, 30.0, -95.0), (600, 30.0, -95.0), (1200, 31.0, -95.0),
+        ])
+        v_north, v_east = positions.window_velocity(buffer, head, count, 600)
+        self.assertAlmostEqual(v_north, positions.KM_PER_DEGREE / 10, places=3)
+        self.assertAlmostEqual(v_east, 0.0, places=6)
+        self.assertIsNone(positions.window_velocity(buffer, head, count, 601))
+
+
+class ApproachEtaTests(TestCase):
+
+    def test_truck_heading_toward_event(self):
+        # 50km south of a 10km event, driving north at 1 km/min
+        lat = 30.0 - 50 / positions.KM_PER_DEGREE
+        eta = positions.approach_eta(lat, -95.0, 1.0, 0.0, 30.0, -95.0, 10, horizon_minutes=60)
+        self.assertAlmostEqual(eta, 40.0, places=3)
+
+    def test_truck_heading_away_from_event(self):
+        lat = 30.0 - 50 / positions.KM_PER_DEGREE
+        self.assertIsNone(positions.approach_eta(lat, -95.0, -1.0, 0.0, 30.0, -95.0, 10, horizon_minutes=60))
+
+    def test_entry_beyond_horizon(self):
+        lat = 30.0 - 50 / positions.KM_PER_DEGREE
+        self.assertIsNone(positions.approach_eta(lat, -95.0, 1.0, 0.0, 30.0, -95.0, 10, horizon_minutes=30))
+
+    def test_stationary_truck(self):
+        self.assertIsNone(positions.approach_eta(29.0, -95.0, 0.0, 0.0, 30.0, -95.0, 10, horizon_minutes=60))
+
+
+@override_settings(POSITION_HISTORY_CAPACITY=4)
+class PositionHistoryTests(TestCase):
+
+    def setUp(self):
+        self.truck = make_truck()
+
+    def test_position_at(self):
+        history = TruckPositionHistory.for_truck_id(self.truck.id)
+        history.append([(utc(epoch), 30.0, -95.0 + epoch / 1000) for epoch in (1000, 2000, 3000)])
+
+        when, lat, lon = history.position_at(utc(2500))
+        self.assertEqual(when, utc(2000))
+        self.assertAlmostEqual(lon, -93.0, places=4)
+        self.assertIsNone(history.position_at(utc(999)))
+
+    def test_current_position_keeps_input_precision(self):
+        recorded_at = datetime(2024, 5, 1, 12, 0, 0, 123456, tzinfo=dt_timezone.utc)
+        updated = record_positions([(self.truck.id, recorded_at, 29.123456789, -95.987654321)])
+
+        self.assertEqual(updated, 1)
+        self.truck.refresh_from_db()
+        self.assertEqual(self.truck.current_lat, 29.123456789)
+        self.assertEqual(self.truck.current_lon, -95.987654321)
+        self.assertEqual(self.truck.last_update, recorded_at)
+
+    def test_late_fix_does_not_move_truck(self):
+        recorded_at = datetime(2024, 5, 1, 12, 0, tzinfo=dt_timezone.utc)
+        record_positions([(self.truck.id, recorded_at, 29.5, -95.5)])
+        updated = record_positions([(self.truck.id, recorded_at - timedelta(minutes=5), 28.0, -94.0)])
+
+        self.assertEqual(updated, 0)
+        self.truck.refresh_from_db()
+        self.assertEqual((self.truck.current_lat, self.truck.current_lon), (29.5, -95.5))
+
+    def test_unstorable_fix_on_empty_history_is_ignored(self):
+        self.assertEqual(record_positions([(self.truck.id, utc(-60), 29.5, -95.5)]), 0)
+
+
+@override_settings(TRUCK_MAX_SPEED_KMH=120, ALERT_APPROACH_MINUTES=30)
+class ApproachAlertTests(TestCase):
+    """Event at (30, -95) with a 10km radius; reach is 10 + 2 km/min x 30 = 70km"""
+
+    def setUp(self):
+        self.event = WeatherEvent.objects.create(
+            event_type='storm', severity='high', location_name='Test', center_lat=30.0, center_lon=-95.0,
+            radius_km=10, description='Test storm', start_time=datetime(2024, 5, 1, tzinfo=dt_timezone.utc),
+        )
+
+    def truck_south_of_event(self, plate, km):
+        return make_truck(plate, lat=30.0 - km / positions.KM_PER_DEGREE, lon=-95.0)
+
+    def test_candidates_exclude_trucks_inside_radius_and_out_of_reach(self):
+        self.truck_south_of_event('INSIDE', 5)
+        nearby = self.truck_south_of_event('NEARBY', 40)
+        self.truck_south_of_event('FAR', 100)
+
+        self.assertEqual(approaching_truck_ids(self.event, Truck.objects.all(), 30), [nearby.id])
+
+    def test_alerts_truck_driving_toward_event(self):
+        toward = self.truck_south_of_event('TOWARD', 40)
+        away = self.truck_south_of_event('AWAY', 40)
+        now = datetime.now(dt_timezone.utc)
+        # 1 km/min over the last 5 minutes: north for one truck, south for the other
+        record_positions([
+            (toward.id, now - timedelta(minutes=5), toward.current_lat - 5 / positions.KM_PER_DEGREE, -95.0),
+            (toward.id, now, toward.current_lat, -95.0),
+            (away.id, now - timedelta(minutes=5), away.current_lat + 5 / positions.KM_PER_DEGREE, -95.0),
+            (away.id, now, away.current_lat, -95.0),
+        ])
+
+        generate_alerts_for_event(self.event.id)
+
+        self.assertEqual(list(Alert.objects.values_list('truck_id', flat=True)), [toward.id])
+
+
+@override_settings(ALLOWED_HOSTS=['*'])
+class PositionApiTests(TestCase):
+
+    def setUp(self):
+        self.truck = make_truck()
+        self.client = APIClient()
+
+    def test_recorded_at_outside_epoch_range_is_rejected(self):
+        for recorded_at in ('2200-01-01T00:00:00Z', '1969-12-31T23:59:59Z'):
+            response = self.client.post('/api/trucks/positions/', [
+                {'truck_id': self.truck.id, 'recorded_at': recorded_at, 'lat': 29.5, 'lon': -95.5},
+            ], format='json')
+            self.assertEqual(response.status_code, 400, recorded_at)
+
+    def test_history_rejects_invalid_bounds(self):
+        for query in ('start=2024-13-45T00:00:00', 'start=garbage', 'end=yesterday'):
+            response = self.client.get(f'/api/trucks/{self.truck.id}/history/?{query}')
+            self.assertEqual(response.status_code, 400, query)
+
+    def test_history_range(self):
+        record_positions([
+            (self.truck.id, datetime(2024, 5, 1, hour, tzinfo=dt_timezone.utc), 29.5, -95.5)
+            for hour in (10, 11, 12)
+        ])
+        response = self.client.get(
+            f'/api/trucks/{self.truck.id}/history/?start=2024-05-01T11:00:00Z&end=2024-05-01T12:00:00Z'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 2)
+
+
+class RouterTests(SimpleTestCase):
+
+    def test_write_outside_a_request_is_not_recorded(self):
+        PrimaryReplicaRouter().db_for_write(Alert)
+        self.assertIsNone(wrote_to_primary())
+
+    def test_write_inside_a_request_is_recorded_and_reset(self):
+        with request_routing_state(pinned=False):
+            self.assertIs(wrote_to_primary(), False)
+            PrimaryReplicaRouter().db_for_write(Alert)
+            self.assertIs(wrote_to_primary(), True)
+        self.assertIsNone(wrote_to_primary())
+
+    def test_reads_stay_on_primary_unless_opted_in(self):
+        self.assertEqual(Alert.objects.all().db, 'default')
+
+
+class PrimaryStickinessMiddlewareTests(SimpleTestCase):
+
+    def respond(self, writes, cookies=None):
+        def view(request):
+            if writes:
+                PrimaryReplicaRouter().db_for_write(Alert)
+            return HttpResponse()
+
+        request = RequestFactory().get('/')
+        request.COOKIES.update(cookies or {})
+        return PrimaryStickinessMiddleware(view)(request)
+
+    def test_write_pins_client_to_primary(self):
+        response = self.respond(writes=True)
+        self.assertEqual(response.cookies[PIN_COOKIE]['max-age'], settings.REPLICA_STICKY_SECONDS)
+
+    def test_read_does_not_pin(self):
+        self.assertNotIn(PIN_COOKIE, self.respond(writes=False).cookies)
+        self.assertNotIn(PIN_COOKIE, self.respond(writes=False, cookies={PIN_COOKIE: '1'}).cookies)
+
+
+# Run with a replica alias, e.g. SQLITE_REPLICA_PATH=replica.sqlite3 python manage.py test.
+# Under test the replica mirrors the default test database; TransactionTestCase
+# commits test data so the replica connection can see it.
+@skipUnless(replica_configured(), "no replica database configured")
+@override_settings(ALLOWED_HOSTS=['*'])
+class ReplicaRoutingTests(TransactionTestCase):
+    databases = '__all__'
+
+    def setUp(self):
+        self.alert = make_alert(make_truck())
+
+    def test_opted_in_reads_use_replica(self):
+        with request_routing_state(pinned=False), replica_reading():
+            self.assertEqual(Alert.objects.all().db, REPLICA)
+
+    def test_pinned_request_reads_primary(self):
+        with request_routing_state(pinned=True), replica_reading():
+            self.assertEqual(Alert.objects.all().db, 'default')
+
+    def test_reads_after_a_write_in_the_same_request_use_primary(self):
+        with request_routing_state(pinned=False), replica_reading():
+            self.alert.save()
+            self.assertEqual(Alert.objects.all().db, 'default')
+
+    def test_write_outside_a_request_does_not_pin_later_reads(self):
+        self.alert.save()
+        with replica_reading():
+            self.assertEqual(Alert.objects.all().db, REPLICA)
+
+    def test_dashboard_reads_replica_until_client_writes(self):
+        with CaptureQueriesContext(connections[REPLICA]) as replica_queries:
+            self.client.get('/')
+        self.assertTrue(replica_queries.captured_queries)
+
+        self.client.post(f'/api/alerts/{self.alert.id}/acknowledge/')
+        with CaptureQueriesContext(connections[REPLICA]) as replica_queries:
+            self.client.get('/')
+        self.assertFalse(replica_queries.captured_queries)
+
+
+@override_settings(ALLOWED_HOSTS=['*'])
+class ArchivedAlertTests(TestCase):
+
+    def setUp(self):
+        truck = make_truck()
+        self.active = make_alert(truck)
+        self.archived = make_alert(truck, status='archived')
+        # Read from the primary even when a replica alias is configured
+        self.client.cookies[PIN_COOKIE] = '1'
+
+    def test_archived_alerts_hidden_from_dashboard_and_lists(self):
+        self.assertEqual(self.client.get('/').context['total_alerts'], 1)
+        self.assertEqual(list(self.client.get('/htmx/alerts/').context['alerts']), [self.active])
+        self.assertEqual([alert['id'] for alert in self.client.get('/api/alerts/').json()], [self.active.id])
+
+    def test_archived_alert_cannot_be_acknowledged(self):
+        response = self.client.post(f'/api/alerts/{self.archived.id}/acknowledge/')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['status'], 'archived')
+
+        response = self.client.post(f'/htmx/alerts/{self.archived.id}/acknowledge/')
+        self.assertEqual(response.status_code, 409)
+
+        self.archived.refresh_from_db()
+        self.assertEqual(self.archived.status, 'archived')
+        self.assertIsNone(self.archived.acknowledged_at)
+
+
+class EstimatedCountPaginatorTests(TestCase):
+
+    def test_exact_count_without_postgres_estimate(self):
+        truck = make_truck()
+        alerts = [make_alert(truck) for _ in range(3)]
+        alerts[-1].delete()
+
+        paginator = EstimatedCountPaginator(Alert.objects.all(), 10)
+        paginator.exact_count_threshold = 0
+        self.assertEqual(paginator.count, 2)
+
+
+class ParallelMatchingTests(TestCase):
+    """Parallel matching mode must produce exactly what the serial path does"""
+
+    def setUp(self):
+        self.event = WeatherEvent.objects.create(
+            event_type='flood', severity='high', location_name='Test', center_lat=30.0, center_lon=-95.0,
+            radius_km=32, description='Test flood', start_time=datetime(2024, 5, 1, tzinfo=dt_timezone.utc),
+        )
+        # One truck every 5km north of the centre: critical, standard and outside the radius
+        for km in range(0, 60, 5):
+            make_truck(f'PAR-{km:03d}', lat=30.0 + km / positions.KM_PER_DEGREE, lon=-95.0)
+
+    def alert_rows(self):
+        return set(Alert.objects.values_list('truck_id', 'priority', 'title', 'message'))
+
+    def test_match_fleet_workers_agree_with_serial(self):
+        rows = [
+            (truck.id, truck.current_lat, truck.current_lon, truck.current_driver_id, 0.0, 0.0)
+            for truck in Truck.objects.order_by('id')
+        ]
+        threshold = critical_threshold(self.event.event_type, self.event.severity)
+        serial = match_fleet(event_payload(self.event), rows, 1, threshold)
+
+        self.assertEqual(match_fleet(event_payload(self.event), rows, 3, threshold), serial)
+        self.assertEqual(len(serial), 7)
+
+    def test_parallel_mode_creates_same_alerts_and_skips_existing(self):
+        self.assertEqual(generate_alerts_for_event(self.event.id, workers=1), 7)
+        serial = self.alert_rows()
+        Alert.objects.all().delete()
+
+        self.assertEqual(generate_alerts_for_event(self.event.id, workers=3), 7)
+        self.assertEqual(self.alert_rows(), serial)
+        self.assertEqual(generate_alerts_for_event(self.event.id, workers=3), 0)
+
+    def test_concurrent_insert_is_dropped_from_count(self):
+        first_truck = Truck.objects.order_by('id').first()
+
+        def match_then_race(*args, **kwargs):
+            # Another run inserts an alert for the same event after our duplicate check
+            matches = match_fleet(*args, **kwargs)
+            Alert.objects.create(
+                weather_event=self.event, truck=first_truck, driver=first_truck.current_driver,
+                priority='critical', title='Concurrent', message='Concurrent',
+            )
+            return matches
+
+        with mock.patch('alerts.services.match_fleet', side_effect=match_then_race):
+            created = generate_alerts_for_event(self.event.id, workers=3)
+
+        self.assertEqual(created, 6)
+        self.assertEqual(Alert.objects.count(), 7)
+        self.assertEqual(Alert.objects.get(truck=first_truck).title, 'Concurrent')
+
+
+@override_settings(ALLOWED_HOSTS=['*'])
+class ValuesSerializerTests(TestCase):
+    """The values() fast path must render byte-for-byte what the ModelSerializers do"""
+
+    def setUp(self):
+        truck = make_truck()
+        make_alert(truck)
+        acknowledged = make_alert(truck, status='acknowledged', priority='standard')
+        acknowledged.acknowledged_at = datetime(2024, 5, 1, 12, 30, 15, 250000, tzinfo=dt_timezone.utc)
+        acknowledged.save()
+        Truck.objects.create(license_plate='NO-DRIVER', current_lat=30.0, current_lon=-95.0)
+
+    def assertSameBytes(self, fast, model):
+        self.assertEqual(JSONRenderer().render(fast.data), JSONRenderer().render(model.data))
+
+    def test_alerts_render_identically(self):
+        alerts = Alert.objects.select_related('truck', 'driver__user', 'weather_event')
+        self.assertSameBytes(AlertValuesSerializer(alerts), AlertSerializer(alerts, many=True))
+        self.assertIsNone(AlertValuesSerializer(alerts.filter(status='pending')).data[0]['acknowledged_at'])
+
+    def test_trucks_render_identically(self):
+        trucks = Truck.objects.select_related('current_driver__user').order_by('id')
+        self.assertSameBytes(TruckValuesSerializer(trucks), TruckSerializer(trucks, many=True))
+        self.assertNotIn('driver_name', TruckValuesSerializer(trucks.filter(current_driver=None)).data[0])
+
+    def test_critical_endpoint_fast_path(self):
+        # Read from the primary even when a replica alias is configured
+        self.client.cookies[PIN_COOKIE] = '1'
+        with override_settings(FAST_LIST_SERIALIZATION=False):
+            expected = self.client.get('/api/alerts/critical/')
+        with override_settings(FAST_LIST_SERIALIZATION=True):
+            response = self.client.get('/api/alerts/critical/')
+
+        self.assertEqual(len(response.json()), 1)
+        self.assertEqual(response.content, expected.content)
+
+
+def legacy_priority(event_type, severity, distance_km):
+    """The hard-coded rules PriorityRule replaced"""
+    if severity == 'severe':
+        return Alert.PRIORITY_CRITICAL
+    if severity == 'high' and distance_km < 20:
+        return Alert.PRIORITY_CRITICAL
+    if event_type in ['flood', 'storm', 'ice'] and distance_km < 10:
+        return Alert.PRIORITY_CRITICAL
+    return Alert.PRIORITY_STANDARD
+
+
+class PriorityRuleTests(TestCase):
+
+    def setUp(self):
+        priority.invalidate_priority_table()
+        self.addCleanup(priority.invalidate_priority_table)
+
+    def classify(self, event_type, severity, distance_km):
+        return classify_alert_priority(WeatherEvent(event_type=event_type, severity=severity), distance_km)
+
+    def test_seeded_rules_match_legacy_rules(self):
+        table = compile_priority_table(PriorityRule.objects.filter(is_active=True))
+        for event_type, _ in WeatherEvent.EVENT_TYPES:
+            for severity, _ in WeatherEvent.SEVERITY_CHOICES:
+                for distance_km in (0, 5, 9.9, 10, 15, 19.9, 20, 50, 5000):
+                    self.assertEqual(
+                        priority_for_distance(table[event_type, severity], distance_km),
+                        legacy_priority(event_type, severity, distance_km),
+                        (event_type, severity, distance_km),
+                    )
+
+    def test_default_rule_examples(self):
+        self.assertEqual(self.classify('fog', 'severe', 5000), Alert.PRIORITY_CRITICAL)
+        # High flood: the 20km severity rule beats the 10km event type rule
+        self.assertEqual(self.classify('flood', 'high', 15), Alert.PRIORITY_CRITICAL)
+        self.assertEqual(self.classify('storm', 'moderate', 12), Alert.PRIORITY_STANDARD)
+        self.assertEqual(critical_threshold('fog', 'low'), 0.0)
+        self.assertEqual(self.classify('fog', 'low', 0), Alert.PRIORITY_STANDARD)
+
+    def test_saving_or_deleting_a_rule_clears_the_cache(self):
+        self.assertEqual(critical_threshold('fog', 'low'), 0.0)
+
+        rule = PriorityRule.objects.create(event_type='fog', severity='low', critical_within_km=5)
+        self.assertIsNone(priority._table)
+        self.assertEqual(critical_threshold('fog', 'low'), 5.0)
+
+        rule.delete()
+        self.assertIsNone(priority._table)
+        self.assertEqual(critical_threshold('fog', 'low'), 0.0)
+
+    def test_refresh_picks_up_edits_made_without_signals(self):
+        refresh_priority_table()
+
+        # Bulk insert: no signal, but the rule count changes
+        PriorityRule.objects.bulk_create([PriorityRule(event_type='fog', severity='low', critical_within_km=5)])
+        self.assertEqual(critical_threshold('fog', 'low'), 0.0)
+        self.assertEqual(refresh_priority_table()['fog', 'low'], 5.0)
+
+        # Edit saved by another process: same count, newer updated_at
+        PriorityRule.objects.filter(event_type='fog', severity='low').update(
+            critical_within_km=8, updated_at=timezone.now()
+        )
+        self.assertEqual(refresh_priority_table()['fog', 'low'], 8.0)
+
+
+class AlertAdminTests(TestCase):
+    """The Alert changelist must stay cheap on a multi-million-row table"""
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'password'))
+        self.url = reverse('admin:alerts_alert_changelist')
+        self.truck = make_truck('TX-100')
+
+    def post_action(self, action, alerts):
+        with CaptureQueriesContext(connections['default']) as queries:
+            response = self.client.post(self.url, {
+                'action': action, '_selected_action': [alert.id for alert in alerts],
+            }, follow=True)
+        updates = [query['sql'] for query in queries.captured_queries if query['sql'].startswith('UPDATE "alerts_alert"')]
+        return response, updates
+
+    def messages(self, response):
+        return [str(message) for message in response.context['messages']]
+
+    def test_acknowledge_action_is_one_update_skipping_other_statuses(self):
+        acknowledged_at = datetime(2024, 5, 1, tzinfo=dt_timezone.utc)
+        alerts = {status: make_alert(self.truck, status=status) for status in ('pending', 'delivered', 'archived')}
+        alerts['acknowledged'] = make_alert(self.truck, status='acknowledged')
+        Alert.objects.filter(id=alerts['acknowledged'].id).update(acknowledged_at=acknowledged_at)
+
+        response, updates = self.post_action('acknowledge_alerts', alerts.values())
+
+        self.assertEqual(len(updates), 1)
+        self.assertIn("2 alert(s) acknowledged.", self.messages(response))
+        statuses = {status: Alert.objects.get(id=alert.id) for status, alert in alerts.items()}
+        self.assertEqual(statuses['pending'].status, 'acknowledged')
+        self.assertEqual(statuses['delivered'].status, 'acknowledged')
+        self.assertEqual(statuses['archived'].status, 'archived')
+        self.assertEqual(statuses['acknowledged'].acknowledged_at, acknowledged_at)
+
+    def test_archive_action_is_one_update_skipping_archived(self):
+        alerts = [make_alert(self.truck, status=status) for status in ('pending', 'acknowledged', 'archived')]
+
+        response, updates = self.post_action('archive_alerts', alerts)
+
+        self.assertEqual(len(updates), 1)
+        self.assertIn("2 alert(s) archived.", self.messages(response))
+        self.assertEqual(Alert.objects.filter(status='archived').count(), 3)
+
+    def test_search_is_upper_cased_plate_prefix(self):
+        match = make_alert(self.truck)
+        make_alert(make_truck('TX-200'))
+        make_alert(make_truck('OK-100'))
+
+        response = self.client.get(self.url, {'q': ' tx-1 '})
+
+        self.assertEqual(list(response.context['cl'].result_list), [match])
+
+    def test_changelist_query_count_does_not_grow_with_rows(self):
+        make_alert(self.truck)
+        with CaptureQueriesContext(connections['default']) as few:
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+
+        for index in range(10):
+            make_alert(make_truck(f'TX-{300 + index}'))
+        with CaptureQueriesContext(connections['default']) as many:
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+
+        self.assertEqual(len(many.captured_queries), len(few.captured_queries))
@@ -1,24 +1,67 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action, api_view
 from rest_framework.response import Response
+from django.conf import settings
 from django.utils import timezone
+from django.http import HttpResponse
 from django.shortcuts import render, get_object_or_404
 from .models import Alert, WeatherEvent, Truck
-from .serializers import AlertSerializer, WeatherEventSerializer, TruckSerializer
-from .services import generate_alerts_for_event
+from .serializers import (
+    AlertSerializer, WeatherEventSerializer, TruckSerializer,
+    AlertValuesSerializer, TruckValuesSerializer, PositionSampleSerializer,
+    HistoryRangeSerializer,
+)
+from .routers import replica_reads
+from .services import generate_alerts_for_event, record_positions
 
 # ===== REST API VIEWS =====
 
-class AlertViewSet(viewsets.ReadOnlyModelViewSet):
+class FastListMixin:
+    """
+    Serve list responses through a values()-based serializer when
+    settings.FAST_LIST_SERIALIZATION is enabled
+    """
+    values_serializer_class = None
+    
+    def list_response(self, queryset):
+        if settings.FAST_LIST_SERIALIZATION and self.paginator is None:
+            return Response(self.values_serializer_class(queryset).data)
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
+    
+    @replica_reads
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        return self.list_response(queryset)
+
+class AlertViewSet(FastListMixin, viewsets.ReadOnlyModelViewSet):
     """API endpoint for viewing and acknowledging alerts"""
     queryset = Alert.objects.select_related('truck', 'driver', 'weather_event').all()
     serializer_class = AlertSerializer
+    values_serializer_class = AlertValuesSerializer
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        # Archived alerts stay reachable by id but drop out of the list
+        if self.action == 'list':
+            queryset = queryset.exclude(status='archived')
+        return queryset
     
     @action(detail=True, methods=['post'])
     def acknowledge(self, request, pk=None):
         """Acknowledge a specific alert"""
         alert = self.get_object()
         
+        if alert.status == 'archived':
+            return Response({
+                'status': 'archived',
+                'message': 'Archived alerts cannot be acknowledged'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
         if alert.status == 'acknowledged':
             return Response({
                 'status': 'already_acknowledged',
@@ -36,14 +79,14 @@ class AlertViewSet(viewsets.ReadOnlyModelViewSet):
         })
     
     @action(detail=False, methods=['get'])
+    @replica_reads
     def critical(self, request):
         """Get only critical unacknowledged alerts"""
         alerts = self.queryset.filter(
             priority='critical',
             status__in=['pending', 'delivered']
         )
-        serializer = self.get_serializer(alerts, many=True)
-        return Response(serializer.data)
+        return self.list_response(alerts)
 
 class WeatherEventViewSet(viewsets.ModelViewSet):
     """API endpoint for weather events"""
@@ -63,29 +106,65 @@ class WeatherEventViewSet(viewsets.ModelViewSet):
         
         return response
 
-class TruckViewSet(viewsets.ReadOnlyModelViewSet):
+class TruckViewSet(FastListMixin, viewsets.ReadOnlyModelViewSet):
     """API endpoint for viewing trucks"""
     queryset = Truck.objects.select_related('current_driver').all()
     serializer_class = TruckSerializer
+    values_serializer_class = TruckValuesSerializer
+    
+    @action(detail=False, methods=['post'])
+    def positions(self, request):
+        """Bulk GPS ingest: list of {truck_id, recorded_at, lat, lon}"""
+        serializer = PositionSampleSerializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        
+        trucks_updated = record_positions(
+            (sample['truck_id'], sample['recorded_at'], sample['lat'], sample['lon'])
+            for sample in serializer.validated_data
+        )
+        
+        return Response({
+            'status': 'success',
+            'trucks_updated': trucks_updated
+        })
+    
+    @action(detail=True, methods=['get'])
+    def history(self, request, pk=None):
+        """Position history, optionally limited with ?start= and ?end= (ISO 8601)"""
+        truck = self.get_object()
+        bounds = HistoryRangeSerializer(data=request.query_params)
+        bounds.is_valid(raise_exception=True)
+        
+        history = getattr(truck, 'position_history', None)
+        samples = history.between(
+            bounds.validated_data.get('start'), bounds.validated_data.get('end')
+        ) if history else []
+        
+        return Response([
+            {'recorded_at': recorded_at, 'lat': lat, 'lon': lon}
+            for recorded_at, lat, lon in samples
+        ])
 
 
 # ===== HTMX VIEWS =====
 
+@replica_reads
 def dashboard(request):
     """Main dashboard page"""
     context = {
-        'total_alerts': Alert.objects.count(),
+        'total_alerts': Alert.objects.exclude(status='archived').count(),
         'critical_alerts': Alert.objects.filter(priority='critical', status__in=['pending', 'delivered']).count(),
         'active_trucks': Truck.objects.filter(is_active=True).count(),
     }
     return render(request, 'alerts/dashboard.html', context)
 
+@replica_reads
 def alert_list(request):
     """HTMX partial: Returns alert list HTML"""
     priority = request.GET.get('priority', 'all')
     
     # Base queryset
-    alerts = Alert.objects.select_related('truck', 'driver', 'weather_event')
+    alerts = Alert.objects.select_related('truck', 'driver', 'weather_event').exclude(status='archived')
     
     # Filter by priority if specified
     if priority != 'all':
@@ -103,6 +182,10 @@ def acknowledge_alert_htmx(request, alert_id):
     """HTMX endpoint: Acknowledge alert and return updated card"""
     alert = get_object_or_404(Alert, id=alert_id)
     
+    # Leave the card unchanged; HTMX does not swap in error responses
+    if alert.status == 'archived':
+        return HttpResponse("Archived alerts cannot be acknowledged", status=409)
+    
     alert.status = 'acknowledged'
     alert.acknowledged_at = timezone.now()
     alert.save()
@@ -0,0 +1,63 @@
+import os
+import django
+
+# Setup Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+django.setup()
+
+import argparse
+import random
+import time
+
+from alerts.matching import match_fleet
+
+# Scaling benchmark for parallel truck-to-event matching.
+# Runs entirely in memory (no database writes) so timings reflect the
+# CPU-bound distance/priority/message work only.
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark parallel alert matching from 1 to N workers')
+    parser.add_argument('--trucks', type=int, default=200000, help='Synthetic fleet size')
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1, help='Highest worker count to test')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per worker count (best time is reported)')
+    args = parser.parse_args()
+
+    # Heat dome centred on Kansas covering most of the continental US
+    event_data = {
+        'event_type': 'heat',
+        'severity': 'high',
+        'description': 'Extreme heat warning. Stay hydrated and check vehicle cooling systems.',
+        'center_lat': 38.5,
+        'center_lon': -98.0,
+        'radius_km': 1500,
+    }
+
+    random.seed(42)
+    rows = [
+        (truck_id, random.uniform(25.0, 49.0), random.uniform(-124.0, -67.0), truck_id, 0.0, 0.0)
+        for truck_id in range(1, args.trucks + 1)
+    ]
+
+    print(f"🚛 Matching {args.trucks} trucks against a {event_data['radius_km']}km event")
+    print("   cold = first run for a worker count, including process pool startup")
+    print("   best = fastest later run on the warm, reused pool")
+    print(f"\n{'workers':>8} {'cold (s)':>10} {'best (s)':>10} {'trucks/s':>12} {'speedup':>8}")
+
+    baseline = None
+    for workers in range(1, args.max_workers + 1):
+        timings = []
+        for _ in range(args.repeat + 1):
+            start = time.perf_counter()
+            matches = match_fleet(event_data, rows, workers, critical_within_km=20)
+            timings.append(time.perf_counter() - start)
+
+        cold, best = timings[0], min(timings[1:])
+        baseline = baseline or best
+        print(f"{workers:>8} {cold:>10.3f} {best:>10.3f} {args.trucks / best:>12.0f} {baseline / best:>7.2f}x")
+
+    print(f"\n✅ {len(matches)} trucks matched per run")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+import os
+import django
+
+# Setup Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+django.setup()
+
+import argparse
+import random
+import time
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import setup_test_environment
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from alerts.models import Driver, Truck, WeatherEvent, Alert
+from alerts.serializers import AlertSerializer, TruckSerializer, AlertValuesSerializer, TruckValuesSerializer
+
+# Microbenchmark: ModelSerializer vs values() fast path for list endpoints.
+# Seeds a throwaway test database, so the real db.sqlite3 is never touched.
+
+parser = argparse.ArgumentParser(description='Compare list serialization throughput')
+parser.add_argument('--rows', type=int, default=5000, help='Alerts and trucks to seed')
+parser.add_argument('--repeat', type=int, default=5, help='Runs per path (best time is reported)')
+args = parser.parse_args()
+
+setup_test_environment()
+old_name = connection.creation.create_test_db(verbosity=0)
+
+try:
+    print(f"🌱 Seeding {args.rows} trucks and alerts...")
+    users = User.objects.bulk_create([
+        User(username=f'bench_{i}', first_name=f'First{i}', last_name=f'Last{i}')
+        for i in range(args.rows)
+    ])
+    drivers = Driver.objects.bulk_create([Driver(user=user, phone_number='+1-555-0100') for user in users])
+    trucks = Truck.objects.bulk_create([
+        Truck(
+            license_plate=f'BN-{i:06d}',
+            # Leave every tenth truck unassigned to exercise the omitted driver_name
+            current_driver=None if i % 10 == 0 else drivers[i],
+            current_lat=random.uniform(25.0, 49.0),
+            current_lon=random.uniform(-124.0, -67.0),
+        )
+        for i in range(args.rows)
+    ])
+    event = WeatherEvent.objects.create(
+        event_type='ice', severity='high', location_name='Benchmark', center_lat=40.0,
+        center_lon=-95.0, radius_km=3000, description='Benchmark event', start_time=timezone.now()
+    )
+    Alert.objects.bulk_create([
+        Alert(
+            weather_event=event, truck=truck, driver=drivers[i],
+            priority='critical' if i % 3 == 0 else 'standard',
+            acknowledged_at=timezone.now() if i % 2 else None,
+            title='⚠️ CRITICAL: Ice/Freezing', message='Benchmark message\n\nDistance: 1.0km',
+        )
+        for i, truck in enumerate(trucks)
+    ])
+
+    renderer = JSONRenderer()
+
+    def best_time(render):
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            output = render()
+            timings.append(time.perf_counter() - start)
+        return min(timings), output
+
+    cases = [
+        ('alerts', Alert.objects.select_related('truck', 'driver__user', 'weather_event').all(),
+         AlertSerializer, AlertValuesSerializer),
+        ('trucks', Truck.objects.select_related('current_driver__user').all(),
+         TruckSerializer, TruckValuesSerializer),
+    ]
+
+    print(f"\n{'endpoint':>9} {'path':>12} {'rows/s':>10}")
+    for name, queryset, serializer_class, values_serializer_class in cases:
+        model_time, model_output = best_time(
+            lambda: renderer.render(serializer_class(queryset.all(), many=True).data)
+        )
+        values_time, values_output = best_time(
+            lambda: renderer.render(values_serializer_class(queryset.all()).data)
+        )
+
+        print(f"{name:>9} {'serializer':>12} {args.rows / model_time:>10.0f}")
+        print(f"{name:>9} {'values()':>12} {args.rows / values_time:>10.0f}"
+              f"  ({model_time / values_time:.1f}x, identical={model_output == values_output})")
+finally:
+    connection.creation.destroy_test_db(old_name, verbosity=0)
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -49,6 +50,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',  # ADD THIS LINE
     'django.middleware.security.SecurityMiddleware',
+    'alerts.middleware.PrimaryStickinessMiddleware',  # Read-your-writes for replica routing
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -80,12 +82,67 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# DATABASE_PROFILE=local (default): SQLite tuned with WAL so dashboard reads
+# don't block alert writes. SQLITE_REPLICA_PATH adds a read replica alias.
+# DATABASE_PROFILE=postgres: POSTGRES_* env vars (needs psycopg installed).
+# POSTGRES_REPLICA_HOST adds a read replica alias.
+DATABASE_PROFILE = os.environ.get('DATABASE_PROFILE', 'local')
+
+# Keep connections open between requests instead of reconnecting each time
+DB_CONN_MAX_AGE = int(os.environ.get('DB_CONN_MAX_AGE', 600))
+
+if DATABASE_PROFILE == 'postgres':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('POSTGRES_DB', 'fleet_alerts'),
+            'USER': os.environ.get('POSTGRES_USER', 'postgres'),
+            'PASSWORD': os.environ.get('POSTGRES_PASSWORD', ''),
+            'HOST': os.environ.get('POSTGRES_HOST', 'localhost'),
+            'PORT': os.environ.get('POSTGRES_PORT', '5432'),
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': True,
+        }
     }
-}
+    if os.environ.get('POSTGRES_REPLICA_HOST'):
+        DATABASES['replica'] = {
+            **DATABASES['default'],
+            'HOST': os.environ['POSTGRES_REPLICA_HOST'],
+            'PORT': os.environ.get('POSTGRES_REPLICA_PORT', DATABASES['default']['PORT']),
+            'TEST': {'MIRROR': 'default'},
+        }
+else:
+    SQLITE_OPTIONS = {
+        'init_command': (
+            'PRAGMA journal_mode=WAL;'
+            'PRAGMA synchronous=NORMAL;'
+            'PRAGMA busy_timeout=5000;'
+            'PRAGMA temp_store=MEMORY;'
+            'PRAGMA cache_size=-20000;'
+            'PRAGMA mmap_size=134217728;'
+        ),
+        # Take the write lock up front instead of failing on lock upgrade
+        'transaction_mode': 'IMMEDIATE',
+    }
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'db.sqlite3',
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'OPTIONS': SQLITE_OPTIONS,
+        }
+    }
+    if os.environ.get('SQLITE_REPLICA_PATH'):
+        DATABASES['replica'] = {
+            **DATABASES['default'],
+            'NAME': os.environ['SQLITE_REPLICA_PATH'],
+            'TEST': {'MIRROR': 'default'},
+        }
+
+DATABASE_ROUTERS = ['alerts.routers.PrimaryReplicaRouter']
+
+# After a write, pin that client's reads to the primary for this long
+REPLICA_STICKY_SECONDS = 5
 
 
 # Password validation
@@ -132,4 +189,21 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',  # Only for demo
     ]
-}
\ No newline at end of file
+}
+
+# Alert generation
+# Worker processes for truck-to-event matching; 1 keeps the serial path
+ALERT_MATCHING_WORKERS = 1
+ALERT_BULK_BATCH_SIZE = 1000
+
+# Serve alert/truck list endpoints through the values()-based serializers
+FAST_LIST_SERIALIZATION = False
+# Position history
+# Samples kept per truck (12 bytes each); 1440 = one day at one fix per minute
+POSITION_HISTORY_CAPACITY = 1440
+# Trailing window used to derive heading and velocity
+POSITION_TREND_WINDOW_MINUTES = 15
+# Alert trucks projected to enter an event radius within this many minutes; 0 disables
+ALERT_APPROACH_MINUTES = 0
+# Upper bound on truck speed; limits which trucks' history is read for approach checks
+TRUCK_MAX_SPEED_KMH = 130
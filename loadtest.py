@@ -0,0 +1,387 @@
+import os
+import django
+
+# Setup Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+django.setup()
+
+import argparse
+import http.client
+import itertools
+import json
+import math
+import random
+import select
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from urllib.parse import urlsplit
+
+from django.contrib.auth.models import User
+from django.utils import timezone
+
+from alerts.models import Driver, Truck, WeatherEvent
+from alerts.positions import KM_PER_DEGREE
+
+# Synthetic fleet load test
+#
+#   python loadtest.py seed --trucks 50000 --events 200
+#   python manage.py runserver   (or gunicorn) in another terminal
+#   python loadtest.py run --rate 200 --duration 60
+#   python loadtest.py reset
+#
+# Repeat seed/run with growing --trucks to find the fleet size where each
+# endpoint's latency or error rate breaks down.
+#
+# Simulated trucks drive on a steady, slowly drifting heading, so running the
+# server with ALERT_APPROACH_MINUTES > 0 also exercises trend-aware alerts.
+
+LOAD_USER_PREFIX = 'load_'
+LOAD_PLATE_PREFIX = 'LT-'
+LOAD_EVENT_PREFIX = 'Load test: '
+
+# Freight hubs with relative fleet weights; trucks and events cluster around them
+HUBS = [
+    ('Houston', 29.7604, -95.3698, 8),
+    ('Dallas', 32.7767, -96.7970, 8),
+    ('Los Angeles', 34.0522, -118.2437, 10),
+    ('Chicago', 41.8781, -87.6298, 9),
+    ('Atlanta', 33.7490, -84.3880, 7),
+    ('New York', 40.7128, -74.0060, 8),
+    ('Miami', 25.7617, -80.1918, 4),
+    ('Denver', 39.7392, -104.9903, 4),
+    ('Seattle', 47.6062, -122.3321, 4),
+    ('Memphis', 35.1495, -90.0490, 5),
+    ('Kansas City', 39.0997, -94.5786, 4),
+    ('Phoenix', 33.4484, -112.0740, 4),
+]
+
+# Operation mix for `run` (relative weights)
+WORKLOAD = {
+    'gps_update': 50,
+    'driver_critical_poll': 25,
+    'dashboard_poll': 15,
+    'acknowledge': 8,
+    'event_burst': 2,
+}
+
+
+def random_point(spread_deg):
+    """Point near a hub chosen by weight, with gaussian scatter"""
+    name, lat, lon, _ = random.choices(HUBS, weights=[hub[3] for hub in HUBS])[0]
+    return name, random.gauss(lat, spread_deg), random.gauss(lon, spread_deg)
+
+
+def event_fields(index):
+    """Random clustered weather event as API/model field values"""
+    name, lat, lon = random_point(0.5)
+    event_type = random.choice(WeatherEvent.EVENT_TYPES)[0]
+    return {
+        'event_type': event_type,
+        'severity': random.choice(WeatherEvent.SEVERITY_CHOICES)[0],
+        'location_name': f"{LOAD_EVENT_PREFIX}{name} #{index}",
+        'center_lat': round(lat, 5),
+        'center_lon': round(lon, 5),
+        'radius_km': random.choice([10, 25, 40, 60, 80]),
+        'description': f"Synthetic {event_type} event for load testing.",
+        'start_time': timezone.now().isoformat(),
+        'is_active': True,
+    }
+
+
+# ===== SEED =====
+
+def seed(args):
+    print(f"🌱 Seeding {args.trucks} trucks/drivers and {args.events} events...")
+    start = time.perf_counter()
+    existing = Truck.objects.filter(license_plate__startswith=LOAD_PLATE_PREFIX).count()
+
+    users = User.objects.bulk_create([
+        User(username=f"{LOAD_USER_PREFIX}{i}", first_name='Load', last_name=f"Driver {i}")
+        for i in range(existing, existing + args.trucks)
+    ], batch_size=args.batch_size)
+    drivers = Driver.objects.bulk_create([
+        Driver(user=user, phone_number=f"+1-555-{i % 10000:04d}") for i, user in enumerate(users)
+    ], batch_size=args.batch_size)
+
+    trucks = []
+    for i, driver in enumerate(drivers, start=existing):
+        _, lat, lon = random_point(0.6)
+        trucks.append(Truck(
+            license_plate=f"{LOAD_PLATE_PREFIX}{i:07d}",
+            current_driver=driver,
+            current_lat=lat,
+            current_lon=lon,
+        ))
+    Truck.objects.bulk_create(trucks, batch_size=args.batch_size)
+
+    # Seeded events are background data; alerts come from events ingested during `run`
+    WeatherEvent.objects.bulk_create([
+        WeatherEvent(**{**event_fields(i), 'start_time': timezone.now() - timedelta(hours=random.randint(0, 48))})
+        for i in range(args.events)
+    ], batch_size=args.batch_size)
+
+    print(f"✅ Seeded in {time.perf_counter() - start:.1f}s "
+          f"({Truck.objects.filter(license_plate__startswith=LOAD_PLATE_PREFIX).count()} load trucks total)")
+
+
+def reset(args):
+    print("🧹 Removing load-test data...")
+    # Trucks and drivers cascade to alerts and position history
+    Truck.objects.filter(license_plate__startswith=LOAD_PLATE_PREFIX).delete()
+    WeatherEvent.objects.filter(location_name__startswith=LOAD_EVENT_PREFIX).delete()
+    User.objects.filter(username__startswith=LOAD_USER_PREFIX).delete()
+    print("✅ Done")
+
+
+# ===== RUN =====
+
+class Client:
+    """Minimal keep-alive HTTP client, one connection per worker thread"""
+
+    def __init__(self, base_url, timeout):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.timeout = timeout
+        self.local = threading.local()
+
+    def connection(self):
+        """This thread's connection, replaced if the server has closed it while idle"""
+        connection = getattr(self.local, 'connection', None)
+        # An idle kept-alive socket only becomes readable once the server closes it
+        if connection is not None and connection.sock is not None and select.select([connection.sock], [], [], 0)[0]:
+            self.discard()
+            connection = None
+        if connection is None:
+            connection = self.local.connection = http.client.HTTPConnection(
+                self.host, self.port, timeout=self.timeout
+            )
+        return connection
+
+    def discard(self):
+        self.local.connection.close()
+        self.local.connection = None
+
+    def request(self, method, path, payload=None):
+        body = None if payload is None else json.dumps(payload)
+        headers = {'Accept': 'application/json'}
+        if body is not None:
+            headers['Content-Type'] = 'application/json'
+
+        # Retry once, and only on a reused keep-alive connection that turned out
+        # to be stale, where the server cannot have acted on the request
+        for attempt in range(2):
+            connection = self.connection()
+            can_retry = connection.sock is not None and not attempt
+            try:
+                connection.request(method, path, body=body, headers=headers)
+            except (http.client.HTTPException, OSError):
+                # The request was never fully sent
+                self.discard()
+                if can_retry:
+                    continue
+                raise
+
+            try:
+                response = connection.getresponse()
+                return response.status, response.read()
+            except http.client.RemoteDisconnected:
+                # Closed without a response; the server may still have processed
+                # the request, so only idempotent GETs are resent
+                self.discard()
+                if can_retry and method == 'GET':
+                    continue
+                raise
+            except (http.client.HTTPException, OSError):
+                # Timed out or failed mid-response: never resend
+                self.discard()
+                raise
+
+
+class Stats:
+    """Thread-safe per-endpoint latency and error recording"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def record(self, endpoint, seconds, ok):
+        with self.lock:
+            self.latencies[endpoint].append(seconds)
+            if not ok:
+                self.errors[endpoint] += 1
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class Workload:
+    """The simulated fleet: what each operation sends"""
+
+    def __init__(self, client, stats, args):
+        self.client = client
+        self.stats = stats
+        self.args = args
+        self.trucks = list(
+            Truck.objects.filter(license_plate__startswith=LOAD_PLATE_PREFIX, current_lat__isnull=False)
+            .values_list('id', 'current_lat', 'current_lon')
+        )
+        self.ack_candidates = []
+        self.ack_lock = threading.Lock()
+        self.event_numbers = itertools.count(1)
+        # truck id -> simulated motion state, created on a truck's first GPS update
+        self.motion = {}
+        self.motion_lock = threading.Lock()
+
+    def timed(self, endpoint, method, path, payload=None, scheduled_at=None):
+        """
+        Issue one request and record its latency
+
+        The first request of an operation passes the operation's *scheduled*
+        start, so a saturated server shows up as latency rather than a lower
+        request rate. Follow-up requests in the same operation are timed from
+        their own send.
+        """
+        if scheduled_at is None:
+            scheduled_at = time.perf_counter()
+        try:
+            status, body = self.client.request(method, path, payload)
+            ok = status < 400
+        except (http.client.HTTPException, OSError):
+            status, body, ok = None, b'', False
+        self.stats.record(endpoint, time.perf_counter() - scheduled_at, ok)
+        return status, body
+
+    def drive(self, truck_id, lat, lon, now):
+        """Advance a truck along its heading since its previous fix; returns (lat, lon)"""
+        state = self.motion.get(truck_id)
+        if state is None:
+            state = self.motion[truck_id] = {
+                'lat': lat,
+                'lon': lon,
+                'heading': random.uniform(0, 360),
+                'speed_kmh': random.uniform(60, 110),
+                'at': now,
+            }
+
+        km = state['speed_kmh'] * (now - state['at']).total_seconds() / 3600
+        heading = math.radians(state['heading'])
+        state['lat'] += km * math.cos(heading) / KM_PER_DEGREE
+        state['lon'] += km * math.sin(heading) / (KM_PER_DEGREE * math.cos(math.radians(state['lat'])))
+        # Small drift per fix: a road-like course rather than a random walk
+        state['heading'] = (state['heading'] + random.gauss(0, 5)) % 360
+        state['at'] = now
+        return state['lat'], state['lon']
+
+    def gps_update(self, scheduled_at):
+        samples = []
+        # Held while sampling too, so each truck's fixes are sent in time order
+        with self.motion_lock:
+            now = timezone.now()
+            for truck_id, lat, lon in random.sample(self.trucks, min(self.args.gps_batch, len(self.trucks))):
+                lat, lon = self.drive(truck_id, lat, lon, now)
+                samples.append({
+                    'truck_id': truck_id,
+                    'recorded_at': now.isoformat(),
+                    'lat': round(lat, 6),
+                    'lon': round(lon, 6),
+                })
+        self.timed('gps_update', 'POST', '/api/trucks/positions/', samples, scheduled_at=scheduled_at)
+
+    def driver_critical_poll(self, scheduled_at):
+        status, body = self.timed('driver_critical_poll', 'GET', '/api/alerts/critical/', scheduled_at=scheduled_at)
+        if status == 200:
+            ids = [alert['id'] for alert in json.loads(body)[:100]]
+            with self.ack_lock:
+                self.ack_candidates = ids
+
+    def dashboard_poll(self, scheduled_at):
+        self.timed('dashboard_poll', 'GET', '/', scheduled_at=scheduled_at)
+        self.timed('dashboard_alert_list', 'GET', '/htmx/alerts/')
+
+    def acknowledge(self, scheduled_at):
+        with self.ack_lock:
+            alert_id = self.ack_candidates.pop() if self.ack_candidates else None
+        if alert_id is None:
+            return
+        self.timed('acknowledge', 'POST', f'/api/alerts/{alert_id}/acknowledge/', {}, scheduled_at=scheduled_at)
+
+    def event_burst(self, scheduled_at):
+        for _ in range(self.args.burst_size):
+            fields = event_fields(next(self.event_numbers))
+            self.timed('event_ingest', 'POST', '/api/weather-events/', fields, scheduled_at=scheduled_at)
+            # Later events in the burst are timed from their own send
+            scheduled_at = None
+
+
+def run(args):
+    client = Client(args.base_url, args.timeout)
+    stats = Stats()
+    workload = Workload(client, stats, args)
+    if not workload.trucks:
+        print("No load-test trucks found - run `python loadtest.py seed` first")
+        return
+
+    operations = list(WORKLOAD)
+    weights = [WORKLOAD[name] for name in operations]
+    total = int(args.rate * args.duration)
+
+    print(f"🚚 {len(workload.trucks)} trucks, {args.rate} ops/s for {args.duration}s against {args.base_url}")
+
+    # Open-loop dispatch: operations are scheduled at the target rate
+    # regardless of how quickly earlier ones complete
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        for i in range(total):
+            scheduled_at = start + i / args.rate
+            delay = scheduled_at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            operation = getattr(workload, random.choices(operations, weights=weights)[0])
+            pool.submit(operation, scheduled_at)
+    elapsed = time.perf_counter() - start
+
+    print(f"\n📊 Results ({elapsed:.1f}s wall clock)")
+    print(f"{'endpoint':<22} {'requests':>9} {'errors':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for endpoint in sorted(stats.latencies):
+        latencies = sorted(stats.latencies[endpoint])
+        print(f"{endpoint:<22} {len(latencies):>9} {stats.errors[endpoint]:>7} "
+              f"{len(latencies) / elapsed:>8.1f} "
+              f"{percentile(latencies, 50) * 1000:>8.1f} "
+              f"{percentile(latencies, 95) * 1000:>8.1f} "
+              f"{percentile(latencies, 99) * 1000:>8.1f}")
+
+
+parser = argparse.ArgumentParser(description='Synthetic fleet load test')
+subparsers = parser.add_subparsers(dest='command', required=True)
+
+seed_parser = subparsers.add_parser('seed', help='Bulk-create drivers, trucks and events')
+seed_parser.add_argument('--trucks', type=int, default=10000, help='Drivers/trucks to add')
+seed_parser.add_argument('--events', type=int, default=100, help='Background weather events to add')
+seed_parser.add_argument('--batch-size', type=int, default=2000)
+seed_parser.set_defaults(handler=seed)
+
+run_parser = subparsers.add_parser('run', help='Replay a live-fleet workload against a running server')
+run_parser.add_argument('--base-url', default='http://localhost:8000')
+run_parser.add_argument('--rate', type=float, default=50, help='Target operations per second')
+run_parser.add_argument('--duration', type=float, default=30, help='Seconds to run')
+run_parser.add_argument('--concurrency', type=int, default=32, help='Client worker threads')
+run_parser.add_argument('--gps-batch', type=int, default=50, help='Positions per GPS ingest request')
+run_parser.add_argument('--burst-size', type=int, default=5, help='Events per ingest burst')
+run_parser.add_argument('--timeout', type=float, default=30)
+run_parser.set_defaults(handler=run)
+
+reset_parser = subparsers.add_parser('reset', help='Delete all load-test data')
+reset_parser.set_defaults(handler=reset)
+
+args = parser.parse_args()
+args.handler(args)